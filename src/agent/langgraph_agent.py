@@ -1,12 +1,54 @@
 from src.agent.planner import Planner
-from src.agent.memory import ShortTermMemory
+from src.agent.memory import ShortTermMemory, MemoryEvent
 from src.agent.logging_utils import log_thought, log_action, log_observation, log_debug, set_log_paths
 from src.prompts.agent_instructions import AGENT_SYSTEM_PROMPT
 from src.prompts.owasp_top10 import OWASP_TOP10_PROMPTS
 import re
 import os
-import copy
 import time
+import types
+import hashlib
+import threading
+from collections import Counter, deque
+
+_USE_RE = re.compile(r'Use (\w+): (.+)')
+# Tool entry points in dispatch priority order
+_TOOL_METHODS = ('execute', 'browse', 'search', 'retrieve', 'spider')
+# Memory events recorded per agent step: Thought, Action, Observation and the [STOP DECISION] Thought
+_EVENTS_PER_STEP = 4
+
+# System prompt per attack type, concatenated once at import
+_SYSTEM_PROMPTS = {
+    attack_type: AGENT_SYSTEM_PROMPT + '\n' + attack_prompt if attack_prompt else AGENT_SYSTEM_PROMPT
+    for attack_type, (attack_prompt, _) in OWASP_TOP10_PROMPTS.items()
+}
+
+# Per-turn prompt template per attack type; only the dynamic tail is filled in per call
+_TURN_SUFFIX = "\nHistory: {history}\nCurrent state: {state}\nContext: {context}\nWhat should the agent do next?"
+
+
+def _template(prefix):
+    return prefix.replace('{', '{{').replace('}', '}}') + _TURN_SUFFIX
+
+
+_DEFAULT_TEMPLATE = _template(AGENT_SYSTEM_PROMPT)
+_PROMPT_TEMPLATES = {attack_type: _template(sys_prompt) for attack_type, sys_prompt in _SYSTEM_PROMPTS.items()}
+
+_STOP_PROMPT_PREFIX = (
+    AGENT_SYSTEM_PROMPT +
+    "\nIf you have tried all reasonable actions, are repeating, or are unsure, reply with STOP and a brief reason. "
+    "If you should continue, reply with CONTINUE and a brief reason. "
+    "Be decisive. If you are stuck, reply with STOP. "
+    "\nCurrent state: "
+)
+
+# Obvious small talk never needs the LLM to classify it
+_GREETINGS = frozenset({'hi', 'hello', 'hey', 'yo', 'ahoy'})
+# Pirate/investigate decisions keyed by a hash of the normalized user input
+_DECISION_CACHE = {}
+_DECISION_CACHE_SIZE = 1024
+# Shared by concurrent job threads, so lookups and evictions go through this lock
+_DECISION_LOCK = threading.Lock()
 
 PIRATE_CHAT_PROMPT = """
 You are a friendly AI security assistant with a pirate personality. If the user is not asking for a pentest, investigation, or tool action, respond ONLY in a helpful, friendly, and pirate-themed way. Use pirate lingo, humor, and encouragement. Never suggest or mention any tool, command, or security scan unless the user clearly requests a security test or investigation. If the user asks for security analysis or investigation, switch to your professional mode and proceed with the tools.
@@ -16,7 +58,14 @@ class LangGraphAgent:
     """Autonomous pentesting agent using langgraph."""
 
     def __init__(self, tools=None, llm=None, output_dir=None):
-        self.tools = {tool.__class__.__name__: tool for tool in (tools or [])}
+        self.tools = types.MappingProxyType({type(tool).__name__: tool for tool in (tools or ())})
+        self._tool_dispatch = {}
+        for name, tool in self.tools.items():
+            for method_name in _TOOL_METHODS:
+                fn = getattr(tool, method_name, None)
+                if callable(fn):
+                    self._tool_dispatch[name] = fn
+                    break
         self.llm = llm
         self.memory = ShortTermMemory()
         self.planner = Planner()
@@ -32,25 +81,30 @@ class LangGraphAgent:
         return steps
 
     def build_prompt(self, context, state, attack_type=None):
-        sys_prompt = AGENT_SYSTEM_PROMPT
-        if attack_type and attack_type in OWASP_TOP10_PROMPTS:
-            attack_prompt, _ = OWASP_TOP10_PROMPTS[attack_type]
-            if attack_prompt:
-                sys_prompt += '\n' + attack_prompt
-        prompt = (
-            sys_prompt +
-            f"\nCurrent state: {state}\nContext: {context}\nHistory: {self.memory.get_history()}\nWhat should the agent do next?"
-        )
-        return prompt
+        # Static system prompt first, then the history window, then per-turn data, so consecutive
+        # prompts share the longest possible prefix for LLM prompt caching; the window is trimmed
+        # in blocks, so the prefix only resets once every max_recent events
+        template = _PROMPT_TEMPLATES.get(attack_type, _DEFAULT_TEMPLATE)
+        return template.format(history=self.memory.get_history_str(), state=state, context=context)
 
     def pirate_chat(self, user_input):
         prompt = PIRATE_CHAT_PROMPT + f"\nUser: {user_input}\nPirate AI:"
         response = self.llm.generate(prompt)
         log_thought(f"[PIRATE CHAT] {response}")
-        self.memory.add({'type': 'Thought', 'content': f'[PIRATE CHAT] {response}'})
+        self.memory.add(MemoryEvent('Thought', f'[PIRATE CHAT] {response}'))
         return response
 
     def should_investigate(self, user_input):
+        normalized = user_input.strip().lower()
+        if normalized.rstrip('!.?') in _GREETINGS:
+            log_debug("[DECISION] PIRATE (greeting)")
+            return False
+        key = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        with _DECISION_LOCK:
+            cached = _DECISION_CACHE.get(key)
+        if cached is not None:
+            log_debug("[DECISION] cached")
+            return cached
         decision_prompt = (
             "You are a friendly pirate AI security assistant. "
             "If the user is asking for a pentest, scan, investigation, or tool action (like nmap, sqlmap, etc.), reply with exactly INVESTIGATE. "
@@ -58,51 +112,50 @@ class LangGraphAgent:
             "Never suggest a tool unless the user clearly requests a security test or investigation.\n"
             f"User: {user_input}\n"
         )
-        decision = self.llm.generate(decision_prompt).strip().upper()
+        decision = self.llm.generate(decision_prompt, stop_words=('INVESTIGATE', 'PIRATE')).strip().upper()
         log_debug(f"[DECISION] {decision}")
-        return decision == 'INVESTIGATE'
+        investigate = decision == 'INVESTIGATE'
+        # Only remember real classifications, not LLM errors
+        if investigate or decision == 'PIRATE':
+            with _DECISION_LOCK:
+                if key not in _DECISION_CACHE and len(_DECISION_CACHE) >= _DECISION_CACHE_SIZE:
+                    _DECISION_CACHE.pop(next(iter(_DECISION_CACHE)))
+                _DECISION_CACHE[key] = investigate
+        return investigate
 
     def thought(self, context, state, attack_type=None):
         prompt = self.build_prompt(context, state, attack_type)
         thought = self.llm.generate(prompt)
         log_thought(thought)
-        self.memory.add({'type': 'Thought', 'content': thought})
+        self.memory.add(MemoryEvent('Thought', thought))
         return thought
 
     def action(self, thought):
-        match = re.search(r'Use (\w+): (.+)', thought)
+        match = _USE_RE.search(thought)
         if not match:
             action_result = {'error': 'No tool/action specified', 'thought': thought}
-            log_action(action_result)
-            self.memory.add({'type': 'Action', 'content': action_result})
+            self._record_action(action_result)
             return action_result
         tool_name, arg = match.groups()
         tool = self.tools.get(tool_name)
         if not tool:
             action_result = {'error': f'Tool {tool_name} not found', 'thought': thought}
-            log_action(action_result)
-            self.memory.add({'type': 'Action', 'content': action_result})
+            self._record_action(action_result)
             return action_result
-        if hasattr(tool, 'execute'):
-            action_result = tool.execute(arg)
-        elif hasattr(tool, 'browse'):
-            action_result = tool.browse(arg)
-        elif hasattr(tool, 'search'):
-            action_result = tool.search(arg)
-        elif hasattr(tool, 'retrieve'):
-            action_result = tool.retrieve(arg)
-        elif hasattr(tool, 'spider'):
-            action_result = tool.spider(arg)
-        else:
-            action_result = {'error': f'Tool {tool_name} has no valid method', 'thought': thought}
-        log_action({'tool': tool_name, 'arg': arg, 'result': action_result, 'thought': thought})
-        self.memory.add({'type': 'Action', 'content': {'tool': tool_name, 'arg': arg, 'result': action_result, 'thought': thought}})
+        fn = self._tool_dispatch.get(tool_name)
+        action_result = fn(arg) if fn else {'error': f'Tool {tool_name} has no valid method', 'thought': thought}
+        self._record_action({'tool': tool_name, 'arg': arg, 'result': action_result, 'thought': thought})
         return action_result
 
+    def _record_action(self, entry):
+        """Log an action and keep that same entry object in memory."""
+        log_action(entry)
+        self.memory.add(MemoryEvent('Action', entry))
+
     def observation(self, action_result):
         """Observe and log the result of the action."""
         log_observation(action_result)
-        self.memory.add({'type': 'Observation', 'content': action_result})
+        self.memory.add(MemoryEvent('Observation', action_result))
         return action_result
 
     def run(self, user_input, max_steps=100, max_seconds=600):
@@ -115,11 +168,10 @@ class LangGraphAgent:
         # Otherwise, proceed as before
         steps = self.plan(user_input)
         context = {'goal': user_input, 'steps': steps}
-        attack_type = None
-        for k in OWASP_TOP10_PROMPTS:
-            if any(k in step.lower() or k in user_input.lower() for step in steps):
-                attack_type = k
-                break
+        # Lower-case goal and steps once; first OWASP key (in table order) mentioned wins.
+        # Keys contain no whitespace, so joining cannot create matches across items.
+        haystack = '\n'.join([user_input, *steps]).lower()
+        attack_type = next((k for k in OWASP_TOP10_PROMPTS if k in haystack), None)
         state = {
             'steps': steps,
             'goal': user_input,
@@ -132,16 +184,21 @@ class LangGraphAgent:
             'history': []
         }
         if attack_type and OWASP_TOP10_PROMPTS[attack_type][1]:
-            state['payloads_left'] = copy.deepcopy(OWASP_TOP10_PROMPTS[attack_type][1])
+            # Payloads are strings or tuples of strings, so a shallow copy is enough
+            state['payloads_left'] = list(OWASP_TOP10_PROMPTS[attack_type][1])
+        # Serialize context once, and state once per step: the stop prompt and the next thought share it
+        context_str = str(context)
+        state_str = str(state)
         start_time = time.time()
-        recent_actions = []  # Track (command, result) tuples
+        recent_actions = deque(maxlen=4)  # Track (command, result hash) tuples
+        recent_counts = Counter()
         try:
             for i in range(max_steps):
                 if time.time() - start_time > max_seconds:
                     log_thought("[STOP DECISION] Stopping due to max session duration.")
-                    self.memory.add({'type': 'Thought', 'content': '[STOP DECISION] Stopping due to max session duration.'})
+                    self.memory.add(MemoryEvent('Thought', '[STOP DECISION] Stopping due to max session duration.'))
                     break
-                thought = self.thought(context, state, attack_type)
+                thought = self.thought(context_str, state_str, attack_type)
                 yield {'type': 'Thought', 'content': thought}
                 action_result = self.action(thought)
                 yield {'type': 'Action', 'content': action_result}
@@ -150,6 +207,11 @@ class LangGraphAgent:
                 state['last_action'] = thought
                 state['last_observation'] = obs
                 state['history'].append({'thought': thought, 'action': action_result, 'observation': obs})
+                # Cap the state's per-step history to the same window as the memory; each step
+                # adds a thought, an action, an observation and a stop decision, i.e. four memory events
+                if self.memory.max_recent is not None:
+                    del state['history'][:-max(1, self.memory.max_recent // _EVENTS_PER_STEP)]
+                state_str = str(state)
                 # --- Automatic stopping if repeated command/result ---
                 cmd = None
                 result = None
@@ -158,41 +220,41 @@ class LangGraphAgent:
                     # Use only a summary of result for comparison
                     result = str(action_result.get('result', ''))[:200]
                 if cmd and result:
-                    recent_actions.append((cmd, result))
-                    # Only keep last 4
-                    if len(recent_actions) > 4:
-                        recent_actions = recent_actions[-4:]
+                    key = (cmd, hash(result))
+                    # Only keep last 4; un-count the entry the deque is about to evict
+                    if len(recent_actions) == recent_actions.maxlen:
+                        recent_counts[recent_actions[0]] -= 1
+                    recent_actions.append(key)
+                    recent_counts[key] += 1
                     # If the same (cmd, result) appears more than once, stop
-                    if recent_actions.count((cmd, result)) > 1:
+                    if recent_counts[key] > 1:
                         log_thought(f"[STOP DECISION] Stopping due to repeated command/result: {cmd}")
-                        self.memory.add({'type': 'Thought', 'content': f'[STOP DECISION] Stopping due to repeated command/result: {cmd}'})
+                        self.memory.add(MemoryEvent('Thought', f'[STOP DECISION] Stopping due to repeated command/result: {cmd}'))
                         break
                 stop_prompt = (
-                    AGENT_SYSTEM_PROMPT +
-                    "\nIf you have tried all reasonable actions, are repeating, or are unsure, reply with STOP and a brief reason. "
-                    "If you should continue, reply with CONTINUE and a brief reason. "
-                    "Be decisive. If you are stuck, reply with STOP. "
-                    f"\nCurrent state: {state}\nShould the agent continue testing, try a new payload, change tools, or stop and report? Reply with CONTINUE or STOP and a brief reason."
+                    _STOP_PROMPT_PREFIX + state_str +
+                    "\nShould the agent continue testing, try a new payload, change tools, or stop and report? Reply with CONTINUE or STOP and a brief reason."
                 )
-                stop_decision = self.llm.generate(stop_prompt)
+                stop_decision = self.llm.generate(stop_prompt, stop_words=('STOP', 'CONTINUE'))
                 log_thought(f"[STOP DECISION] {stop_decision}")
-                self.memory.add({'type': 'Thought', 'content': f'[STOP DECISION] {stop_decision}'})
+                self.memory.add(MemoryEvent('Thought', f'[STOP DECISION] {stop_decision}'))
                 if 'stop' in stop_decision.lower():
                     break
             else:
                 log_thought("[STOP DECISION] Stopping due to max step limit.")
-                self.memory.add({'type': 'Thought', 'content': '[STOP DECISION] Stopping due to max step limit.'})
+                self.memory.add(MemoryEvent('Thought', '[STOP DECISION] Stopping due to max step limit.'))
         except KeyboardInterrupt:
             log_thought("[STOP DECISION] Stopping due to user interrupt (Ctrl+C).")
-            self.memory.add({'type': 'Thought', 'content': '[STOP DECISION] Stopping due to user interrupt (Ctrl+C).'})
+            self.memory.add(MemoryEvent('Thought', '[STOP DECISION] Stopping due to user interrupt (Ctrl+C).'))
         # --- After stopping, have the LLM analyze the results and provide a summary report ---
         report_prompt = (
-            AGENT_SYSTEM_PROMPT +
+            _SYSTEM_PROMPTS.get(attack_type, AGENT_SYSTEM_PROMPT) +
+            f"\nHistory: {self.memory.get_history_str(full=True)}"
             "\nYou have completed the pentest task. Analyze the actions and observations above and provide a concise summary report of findings, vulnerabilities, and recommendations. Format as Markdown."
-            f"\nHistory: {self.memory.get_history()}\nReport:"
+            "\nReport:"
         )
         report = self.llm.generate(report_prompt)
         log_thought(f"[REPORT] {report}")
-        self.memory.add({'type': 'Report', 'content': report})
+        self.memory.add(MemoryEvent('Report', report))
         yield {'type': 'Report', 'content': report}
-        return self.memory.get_history() 
\ No newline at end of file
+        return self.memory.get_history_full()
\ No newline at end of file
@@ -1,27 +1,161 @@
+import atexit
 import json
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 import os
+import queue
+import threading
 
 LOG_FILE = 'process_logs.json'
 DEBUG_LOG_FILE = 'agent_debug.log'
+_LOG_WRITER = None
+_DEBUG_WRITER = None
+# Guards the log paths and the lazily created writers
+_WRITERS_LOCK = threading.Lock()
+# Events are echoed to the debug log only when AGENT_LOG_LEVEL=DEBUG
+_LOG_LEVEL = os.getenv('AGENT_LOG_LEVEL', 'INFO').upper()
+
+class BackgroundAppender:
+    """
+    Appends bytes to a file from a daemon thread so callers never block on disk IO.
+    Everything queued since the last wake-up is written with a single syscall.
+    Writes that arrive after close() are appended synchronously instead of being dropped.
+    """
+    def __init__(self, path):
+        self._path = path
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def write(self, data):
+        with self._lock:
+            if not self._closed:
+                self._queue.put(data)
+                return
+        # Closed under a thread still holding this appender (e.g. set_log_paths from another job)
+        fd = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Write out everything still queued, then close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        os.close(self._fd)
+
+    def _drain(self):
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                closing = True
+                batch = [data for data in batch if data is not None]
+            data = b''.join(batch)
+            try:
+                while data:
+                    data = data[os.write(self._fd, data):]
+            except OSError as e:
+                print(f"[APPENDER ERROR] {e}")
+
+def json_line(obj):
+    """
+    Serialize obj as one newline-terminated JSON line (bytes).
+    Values orjson rejects, such as ints wider than 64 bits, fall back to stdlib json; other
+    values neither can encode natively are written as their str(). Never raises: if the entry
+    still can't be encoded (e.g. tuple keys or a circular reference), its content is written
+    as its repr() instead.
+    """
+    try:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError:
+        pass
+    try:
+        return (json.dumps(obj, default=str) + '\n').encode()
+    except (TypeError, ValueError):
+        if isinstance(obj, dict) and 'content' in obj:
+            return json_line({**obj, 'content': repr(obj['content'])})
+        return json_line(repr(obj))
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
 
 def set_log_paths(log_file, debug_log_file):
-    global LOG_FILE, DEBUG_LOG_FILE
-    LOG_FILE = log_file
-    DEBUG_LOG_FILE = debug_log_file
+    global LOG_FILE, DEBUG_LOG_FILE, _LOG_WRITER, _DEBUG_WRITER
+    # Swap in the new paths before dropping the writers, so a concurrent job can never
+    # lazily reopen the previous session's files
+    with _WRITERS_LOCK:
+        LOG_FILE = log_file
+        DEBUG_LOG_FILE = debug_log_file
+        writers = (_LOG_WRITER, _DEBUG_WRITER)
+        _LOG_WRITER = None
+        _DEBUG_WRITER = None
+    _close_writers(writers)
+
+def _log_writer():
+    global _LOG_WRITER
+    writer = _LOG_WRITER
+    if writer is None:
+        with _WRITERS_LOCK:
+            if _LOG_WRITER is None:
+                _LOG_WRITER = BackgroundAppender(LOG_FILE)
+            writer = _LOG_WRITER
+    return writer
+
+def _debug_writer():
+    global _DEBUG_WRITER
+    writer = _DEBUG_WRITER
+    if writer is None:
+        with _WRITERS_LOCK:
+            if _DEBUG_WRITER is None:
+                _DEBUG_WRITER = BackgroundAppender(DEBUG_LOG_FILE)
+            writer = _DEBUG_WRITER
+    return writer
+
+def _close_writers(writers):
+    for writer in writers:
+        if writer is not None:
+            writer.close()
+
+def close_logs():
+    """Flush pending log lines and close both log files."""
+    global _LOG_WRITER, _DEBUG_WRITER
+    with _WRITERS_LOCK:
+        writers = (_LOG_WRITER, _DEBUG_WRITER)
+        _LOG_WRITER = None
+        _DEBUG_WRITER = None
+    _close_writers(writers)
+
+atexit.register(close_logs)
 
 def log_event(event_type, content):
     entry = {
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': utc_now(),
         'type': event_type,
         'content': content
     }
+    # Never drop an entry: the report pairs process log steps with outputs positionally
+    line = json_line(entry)
     try:
-        with open(LOG_FILE, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
-    except Exception as e:
+        _log_writer().write(line)
+        if _LOG_LEVEL == 'DEBUG':
+            _debug_writer().write(line)
+    except OSError as e:
         log_debug(f"[LOGGING ERROR] {e}")
-    log_debug(f"{event_type}: {content}")
 
 def log_thought(thought):
     log_event('Thought', thought)
@@ -34,7 +168,6 @@ def log_observation(observation):
 
 def log_debug(message):
     try:
-        with open(DEBUG_LOG_FILE, 'a') as f:
-            f.write(f"{datetime.utcnow().isoformat()} {message}\n")
+        _debug_writer().write(f"{utc_now()} {message}\n".encode())
     except Exception as e:
         print(f"[DEBUG LOGGING ERROR] {e}") 
\ No newline at end of file
@@ -1,10 +1,50 @@
+from typing import Any, NamedTuple
+
+
+class MemoryEvent(NamedTuple):
+    """A single thought, action, observation or report held in memory."""
+    type: str
+    content: Any
+
+    def __repr__(self):
+        # Keep the dict-style rendering the prompts have always shown to the LLM
+        return repr(self._asdict())
+
+
 class ShortTermMemory:
     """Short-term memory for storing actions and results within a session."""
-    def __init__(self):
+    def __init__(self, max_recent=20):
         self.history = []
+        # Number of most recent events shown in prompts (None keeps everything); the window
+        # is trimmed in whole blocks of this size so its start only moves every max_recent events
+        self.max_recent = max_recent
+        self._rendered = []
+        self._history_str = None
+        self._full_history_str = None
     def add(self, event):
         """Add an event (thought, action, observation) to memory."""
         self.history.append(event)
+        # Render each event once; prompts reuse it instead of re-repr'ing the whole history
+        self._rendered.append(repr(event))
+        self._history_str = None
+        self._full_history_str = None
+    def _window_start(self):
+        """Index of the oldest event in the prompt window (between max_recent and 2*max_recent-1 events)."""
+        return max(0, (len(self.history) // self.max_recent - 1) * self.max_recent)
     def get_history(self):
-        """Return the session history."""
-        return self.history 
\ No newline at end of file
+        """Return the most recent events of the session history."""
+        if self.max_recent is None:
+            return self.history
+        return self.history[self._window_start():]
+    def get_history_full(self):
+        """Return the complete session history."""
+        return self.history
+    def get_history_str(self, full=False):
+        """Return the recent (or complete) session history rendered as text for prompts."""
+        if full or self.max_recent is None:
+            if self._full_history_str is None:
+                self._full_history_str = '[' + ', '.join(self._rendered) + ']'
+            return self._full_history_str
+        if self._history_str is None:
+            self._history_str = '[' + ', '.join(self._rendered[self._window_start():]) + ']'
+        return self._history_str
\ No newline at end of file
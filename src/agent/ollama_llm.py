@@ -1,31 +1,51 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 
 class OllamaLLM:
     """LLM backend using Ollama's local API."""
     def __init__(self, base_url="http://localhost:11434", model="llama3"):
         self.base_url = base_url
         self.model = model
+        # Keep-alive session so consecutive prompts reuse the same connection to Ollama
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
-    def generate(self, prompt):
-        """Send prompt to Ollama and return response text (handles streaming JSON lines)."""
+    def generate(self, prompt, stop_words=None):
+        """
+        Send prompt to Ollama and return response text (handles streaming JSON lines).
+        If stop_words is given, reading stops as soon as the response starts with one of them
+        and only the text received so far is returned.
+        """
+        payload = {"model": self.model, "prompt": prompt}
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json={"model": self.model, "prompt": prompt},
+                json=payload,
                 timeout=120,
                 stream=True
             )
             response.raise_for_status()
-            output = ""
+            chunks = []
+            # Stop words only match at the start, so stop checking once the head is longer than all of them
+            head_limit = max(map(len, stop_words)) if stop_words else 0
             for line in response.iter_lines():
                 if not line:
                     continue
                 try:
-                    data = json.loads(line.decode('utf-8'))
-                    output += data.get("response", "")
+                    chunks.append(orjson.loads(line).get("response", ""))
                 except Exception as e:
                     continue  # skip malformed lines
-            return output
+                if head_limit:
+                    head = ''.join(chunks).lstrip().upper()
+                    if head.startswith(stop_words):
+                        response.close()
+                        break
+                    if len(head) >= head_limit:
+                        head_limit = 0
+            output = ''.join(chunks)
         except Exception as e:
-            return f"[Ollama LLM error: {e}]" 
\ No newline at end of file
+            return f"[Ollama LLM error: {e}]"
+        return output
\ No newline at end of file
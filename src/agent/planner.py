@@ -1,6 +1,15 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=128)
+def _plan_steps(goal):
+    # Memoized at module level so every agent's Planner shares it; a tuple so hits can't be mutated
+    # TODO: Implement planning logic
+    return (f"Step for: {goal}",)
+
+
 class Planner:
     """Breaks down high-level goals into discrete actionable steps."""
     def plan(self, goal):
-        """Return a list of steps for the given goal."""
-        # TODO: Implement planning logic
-        return [f"Step for: {goal}"] 
\ No newline at end of file
+        """Return a list of steps for the given goal (memoized per goal)."""
+        return list(_plan_steps(goal))
\ No newline at end of file
@@ -1,15 +1,21 @@
 import json
 import re
 
+_GOAL_RE = re.compile(r'goal: (.+?)(?:\\n|$)', re.IGNORECASE)
+_VULN_RE = re.compile(r'(?:vulnerability|vulnerabilities)[:\s]+(.+?)(?:\\n|$)', re.IGNORECASE)
+_REC_RE = re.compile(r'(?:recommendation|remediation)[:\s]+(.+?)(?:\\n|$)', re.IGNORECASE)
+
+_STEP_TEMPLATE = (
+    "### Step {i}\n\n"
+    "**Action:**\n\n```\n{step}\n```\n\n"
+    "**Observation:**\n\n```\n{output}\n```\n\n"
+)
+
 def generate_report(input_json, output_md):
     """
     Generate a professional Markdown report from process_logs.json.
     Includes executive summary, steps, vulnerabilities, and recommendations.
     """
-    # Read all log lines
-    with open(input_json, 'r') as f:
-        logs = [json.loads(line) for line in f if line.strip()]
-
     # Executive summary: summarize the goal and number of steps
     goal = None
     steps = []
@@ -17,52 +23,48 @@ def generate_report(input_json, output_md):
     recommendations = []
     outputs = []
 
-    for entry in logs:
-        t = entry.get('type')
-        c = entry.get('content')
-        if t == 'Thought' and not goal:
-            # Try to extract goal from first thought
-            m = re.search(r'goal: (.+?)(?:\\n|$)', str(c), re.IGNORECASE)
-            if m:
-                goal = m.group(1)
-        if t == 'Action':
-            steps.append(c)
-        if t == 'Observation':
-            outputs.append(c)
-            # Extract vulnerabilities and recommendations if mentioned
-            if isinstance(c, dict):
-                obs_text = str(c)
-            else:
-                obs_text = c
-            vulns = re.findall(r'(?:vulnerability|vulnerabilities)[:\s]+(.+?)(?:\\n|$)', obs_text, re.IGNORECASE)
-            recs = re.findall(r'(?:recommendation|remediation)[:\s]+(.+?)(?:\\n|$)', obs_text, re.IGNORECASE)
-            vulnerabilities.extend(vulns)
-            recommendations.extend(recs)
+    # Scan the log once, parsing lines as they are read; stdlib json keeps ints wider
+    # than 64 bits exact, where orjson would silently read them back as floats
+    with open(input_json, 'r', encoding='utf-8') as f:
+        for entry in (json.loads(line) for line in f if line.strip()):
+            t = entry.get('type')
+            c = entry.get('content')
+            if t == 'Thought' and not goal:
+                # Try to extract goal from first thought
+                m = _GOAL_RE.search(str(c))
+                if m:
+                    goal = m.group(1)
+            if t == 'Action':
+                steps.append(c)
+            if t == 'Observation':
+                outputs.append(c)
+                # Extract vulnerabilities and recommendations if mentioned
+                if isinstance(c, dict):
+                    obs_text = str(c)
+                else:
+                    obs_text = c
+                vulnerabilities.extend(_VULN_RE.findall(obs_text))
+                recommendations.extend(_REC_RE.findall(obs_text))
+
+    parts = ["# Pentest Report\n\n", "## Executive Summary\n\n"]
+    if goal:
+        parts.append(f"**Goal:** {goal}\n\n")
+    parts.append(f"**Total Steps:** {len(steps)}\n\n")
+    parts.append("## Steps & Outputs\n\n")
+    parts.extend(
+        _STEP_TEMPLATE.format(i=i, step=step, output=output)
+        for i, (step, output) in enumerate(zip(steps, outputs), 1)
+    )
+    parts.append("## Vulnerabilities Found\n\n")
+    if vulnerabilities:
+        parts.extend(f"- {v}\n" for v in vulnerabilities)
+    else:
+        parts.append("None explicitly found in logs.\n")
+    parts.append("\n## Remediation Recommendations\n\n")
+    if recommendations:
+        parts.extend(f"- {r}\n" for r in recommendations)
+    else:
+        parts.append("None explicitly found in logs.\n")
 
     with open(output_md, 'w') as f:
-        f.write("# Pentest Report\n\n")
-        f.write("## Executive Summary\n\n")
-        if goal:
-            f.write(f"**Goal:** {goal}\n\n")
-        f.write(f"**Total Steps:** {len(steps)}\n\n")
-        f.write("## Steps & Outputs\n\n")
-        for i, (step, output) in enumerate(zip(steps, outputs), 1):
-            f.write(f"### Step {i}\n\n")
-            f.write("**Action:**\n\n```")
-            f.write(f"{step}\n")
-            f.write("```\n\n")
-            f.write("**Observation:**\n\n```")
-            f.write(f"{output}\n")
-            f.write("```\n\n")
-        f.write("## Vulnerabilities Found\n\n")
-        if vulnerabilities:
-            for v in vulnerabilities:
-                f.write(f"- {v}\n")
-        else:
-            f.write("None explicitly found in logs.\n")
-        f.write("\n## Remediation Recommendations\n\n")
-        if recommendations:
-            for r in recommendations:
-                f.write(f"- {r}\n")
-        else:
-            f.write("None explicitly found in logs.\n") 
\ No newline at end of file
+        f.write(''.join(parts))
\ No newline at end of file
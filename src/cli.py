@@ -14,12 +14,14 @@ from src.tools.web_search_tool import WebSearchTool
 from src.tools.rag_tool import RAGTool
 from src.tools.kali_container_tool import KaliContainerTool
 from src.agent.reporting import generate_report
-import os
+import pathlib
 import uuid
 
 console = Console()
 
 def stream_history(history):
+    # Print each panel as its event arrives; agent.run is a generator, so batching the
+    # panels into one Group would hold all output back until the task finishes
     for event in history:
         t = event.get('type')
         c = event.get('content')
@@ -40,11 +42,10 @@ def main():
 @main.command()
 @click.option('--task', required=True, help='High-level pentest goal/task')
 def run(task):
-    # Create outputs directory and unique session directory
-    os.makedirs('outputs', exist_ok=True)
+    # Create the unique session directory (and outputs/ with it)
     session_id = str(uuid.uuid4())
-    session_dir = os.path.join('outputs', session_id)
-    os.makedirs(session_dir, exist_ok=True)
+    session_dir = pathlib.Path('outputs') / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
     console.print(f"[bold magenta]Session UUID:[/bold magenta] {session_id}")
     console.print(f"[bold green]Running pentest task:[/bold green] {task}")
     # Instantiate tools and LLM
@@ -58,8 +59,7 @@ def run(task):
     ]
     llm = OllamaLLM()
     agent = LangGraphAgent(tools=tools, llm=llm, output_dir=session_dir)
-    history = agent.run(task)
-    stream_history(history)
+    stream_history(agent.run(task))
     console.print(f"[bold green]Pentest task complete. See {session_dir} for all outputs and logs.[/bold green]")
 
 @main.group()
@@ -4,6 +4,7 @@ import time
 import json
 import pandas as pd
 import threading
+import subprocess
 from src.agent.agent_service import run_agent_job
 from src.frontend.components import render_toolbar, render_chat, render_thinking, render_vuln_table, render_status
 
@@ -13,15 +14,28 @@ st.set_page_config(page_title="Pentest-Agent", layout="wide")
 HAS_AUTOREFRESH = hasattr(st, "autorefresh") or hasattr(st, "experimental_autorefresh")
 
 # --- Small Tools Bar ---
+@st.cache_data(ttl=10)
+def _running_containers():
+    """Names of running docker containers, refreshed at most every 10 seconds."""
+    try:
+        out = subprocess.run(['docker', 'ps', '--format', '{{.Names}}'], capture_output=True, text=True, timeout=2).stdout
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return ()
+    return tuple(out.split())
+
+def _container_running(name):
+    # Substring match, like the old `docker ps | grep <name>` probe
+    return any(name in container for container in _running_containers())
+
 tools = {
     "ShellTool": True,
     "PythonREPLTool": True,
     "WebBrowserTool": True,
     "WebSearchTool": True,
     "RAGTool": True,
-    "KaliContainerTool": os.system("docker ps | grep kali > /dev/null") == 0,
-    "Playwright": os.system("docker ps | grep pentest-playwright > /dev/null") == 0,
-    "ZAP": os.system("docker ps | grep pentest-zap > /dev/null") == 0,
+    "KaliContainerTool": _container_running("kali"),
+    "Playwright": _container_running("pentest-playwright"),
+    "ZAP": _container_running("pentest-zap"),
 }
 render_toolbar(tools)
 
@@ -41,14 +55,21 @@ if 'agent_thread' not in st.session_state:
     st.session_state['agent_thread'] = None
 if 'last_agent_event' not in st.session_state:
     st.session_state['last_agent_event'] = None
-if 'last_event_idx' not in st.session_state:
-    st.session_state['last_event_idx'] = 0
+if 'last_event_offset' not in st.session_state:
+    st.session_state['last_event_offset'] = 0
 if 'agent_start_time' not in st.session_state:
     st.session_state['agent_start_time'] = None
 
 # --- Chat UI ---
 render_chat(st.session_state['chat_history'], st.session_state['agent_running'])
 
+def _append_once(msg):
+    # Skip only an immediate repeat: re-polled events land at the tail, while the same
+    # prompt or observation appearing again later in a session is a real new message
+    chat_history = st.session_state['chat_history']
+    if not chat_history or chat_history[-1] != msg:
+        chat_history.append(msg)
+
 # --- Agent Execution (Background Thread) ---
 def agent_worker(user_input, output_dir, session_id):
     run_agent_job(user_input, output_dir, session_id)
@@ -62,7 +83,7 @@ if user_input:
     st.session_state['agent_running'] = True
     st.session_state['last_agent_event'] = None
     st.session_state['agent_start_time'] = time.time()
-    # Do NOT increment last_event_idx here
+    # Do NOT advance last_event_offset here
     # Start agent in background thread
     thread = threading.Thread(target=agent_worker, args=(user_input, st.session_state['output_dir'], st.session_state['session_id']))
     thread.start()
@@ -81,18 +102,21 @@ if os.path.exists(event_log_path):
         st.autorefresh(interval=1000, key="autorefresh")  # Poll every 1s
     elif hasattr(st, 'experimental_autorefresh'):
         st.experimental_autorefresh(interval=1000, key="autorefresh")
-    # Read new events from the event log
-    with open(event_log_path, 'r') as f:
-        lines = f.readlines()
-    new_events = lines[st.session_state['last_event_idx']:]
+    # Read only the bytes appended since the last poll; a partially written
+    # last line is left in place for the next tick. Lines are decoded with stdlib json,
+    # which keeps ints wider than 64 bits exact where orjson would return floats
+    with open(event_log_path, 'rb') as f:
+        f.seek(st.session_state['last_event_offset'])
+        chunk = f.read()
+    end = chunk.rfind(b'\n') + 1
+    new_events = chunk[:end].splitlines()
     for line in new_events:
         try:
             event = json.loads(line)
             t = event.get('type')
             c = event.get('content')
             if t == 'USER':
-                if not st.session_state['chat_history'] or st.session_state['chat_history'][-1] != {'role': 'user', 'content': c}:
-                    st.session_state['chat_history'].append({'role': 'user', 'content': c})
+                _append_once({'role': 'user', 'content': c})
             elif t == 'STARTED':
                 status_message = f"🤖 {c}"
             elif t == 'DONE':
@@ -114,25 +138,17 @@ if os.path.exists(event_log_path):
                     st.experimental_rerun()
                 break
             elif t == 'PirateChat':
-                msg = {'role': 'assistant', 'content': f"☠️ {c}"}
-                if not st.session_state['chat_history'] or st.session_state['chat_history'][-1] != msg:
-                    st.session_state['chat_history'].append(msg)
+                _append_once({'role': 'assistant', 'content': f"☠️ {c}"})
             elif t == 'Thought':
-                msg = {'role': 'assistant', 'content': f"🧠 {c}"}
-                if not st.session_state['chat_history'] or st.session_state['chat_history'][-1] != msg:
-                    st.session_state['chat_history'].append(msg)
+                _append_once({'role': 'assistant', 'content': f"🧠 {c}"})
             elif t == 'Action':
-                msg = {'role': 'assistant', 'content': f"⚡ {c}"}
-                if not st.session_state['chat_history'] or st.session_state['chat_history'][-1] != msg:
-                    st.session_state['chat_history'].append(msg)
+                _append_once({'role': 'assistant', 'content': f"⚡ {c}"})
             elif t == 'Observation':
-                msg = {'role': 'assistant', 'content': f"🔎 {c}"}
-                if not st.session_state['chat_history'] or st.session_state['chat_history'][-1] != msg:
-                    st.session_state['chat_history'].append(msg)
+                _append_once({'role': 'assistant', 'content': f"🔎 {c}"})
             st.session_state['last_agent_event'] = event
         except Exception:
             continue
-    st.session_state['last_event_idx'] += len(new_events)
+    st.session_state['last_event_offset'] += end
     render_status(st.session_state['agent_running'], {'type': status_message, 'content': status_message} if status_message else st.session_state['last_agent_event'])
     # If agent is stuck for >60s, show an error
     if st.session_state['agent_running'] and st.session_state['agent_start_time'] and (time.time() - st.session_state['agent_start_time'] > 60):
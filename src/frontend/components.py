@@ -1,14 +1,20 @@
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
 import pandas as pd
+import orjson
+from functools import lru_cache
+
+VULN_PAGE_SIZE = 100
+
+@lru_cache(maxsize=64)
+def _tool_html(tool, online):
+    color = '#52c41a' if online else '#f5222d'
+    return f"<div style='display:flex;align-items:center;font-size:13px;'><div style='width:10px;height:10px;background:{color};border-radius:50%;margin-right:4px;'></div>{tool}</div>"
 
 def render_toolbar(tools):
-    st.markdown("---", unsafe_allow_html=True)
-    cols = st.columns(len(tools))
-    for i, (tool, online) in enumerate(tools.items()):
-        color = '#52c41a' if online else '#f5222d'
-        cols[i].markdown(f"<div style='display:flex;align-items:center;font-size:13px;'><div style='width:10px;height:10px;background:{color};border-radius:50%;margin-right:4px;'></div>{tool}</div>", unsafe_allow_html=True)
-    st.markdown("---", unsafe_allow_html=True)
+    # One markdown element for the whole bar instead of one per tool
+    items = ''.join(_tool_html(tool, online) for tool, online in tools.items())
+    st.markdown(f"<hr><div style='display:flex;justify-content:space-between;flex-wrap:wrap;gap:8px;'>{items}</div><hr>", unsafe_allow_html=True)
 
 def render_chat(chat_history, agent_running):
     st.markdown("## 💬 Pentest-Agent Chat", unsafe_allow_html=True)
@@ -36,6 +42,19 @@ def render_status(agent_running, last_event):
     else:
         st.success("Agent status: Idle")
 
+@st.cache_data(max_entries=32)
+def _build_grid_options(schema):
+    """Grid options for a (column, dtype) schema; identical schemas reuse the built dict."""
+    # Each rerun gets its own copy, since AgGrid writes rowData and layout keys into it
+    empty_df = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in schema})
+    gb = GridOptionsBuilder.from_dataframe(empty_df)
+    gb.configure_default_column(editable=False, groupable=True)
+    # Round-trip through JSON to turn the builder's nested defaultdicts into picklable plain dicts
+    return orjson.loads(orjson.dumps(gb.build()))
+
+def _set_vuln_page(page):
+    st.session_state['vuln_page'] = page
+
 def render_vuln_table(vulns_df):
     st.markdown("### Findings / Vulnerabilities")
     if hasattr(vulns_df, 'empty') and vulns_df.empty:
@@ -44,8 +63,17 @@ def render_vuln_table(vulns_df):
     if not hasattr(vulns_df, 'empty') and not vulns_df:
         st.info("No vulnerabilities found yet.")
         return
-    gb = GridOptionsBuilder.from_dataframe(vulns_df)
-    gb.configure_pagination()
-    gb.configure_default_column(editable=False, groupable=True)
-    gridOptions = gb.build()
-    AgGrid(vulns_df, gridOptions=gridOptions, height=250, fit_columns_on_grid_load=True) 
\ No newline at end of file
+    if not isinstance(vulns_df, pd.DataFrame):
+        vulns_df = pd.DataFrame(vulns_df)
+    # Page in Python so only the visible rows are sent to the browser
+    pages = -(-len(vulns_df) // VULN_PAGE_SIZE)
+    page = min(st.session_state.setdefault('vuln_page', 0), pages - 1)
+    start = page * VULN_PAGE_SIZE
+    view = vulns_df.iloc[start:start + VULN_PAGE_SIZE]
+    gridOptions = _build_grid_options(tuple((col, str(dtype)) for col, dtype in vulns_df.dtypes.items()))
+    AgGrid(view, gridOptions=gridOptions, height=250, fit_columns_on_grid_load=True)
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        prev_col.button("Prev", key="vuln_prev", disabled=page == 0, on_click=_set_vuln_page, args=(page - 1,))
+        info_col.markdown(f"Page {page + 1} of {pages}")
+        next_col.button("Next", key="vuln_next", disabled=page == pages - 1, on_click=_set_vuln_page, args=(page + 1,)) 
\ No newline at end of file
@@ -3,7 +3,7 @@ When testing for SQL injection, try multiple payloads (e.g., ' OR 1=1--, "; DROP
 After each test, analyze the output for errors, unexpected data, or signs of injection.
 Continue until a vulnerability is found or all payloads are exhausted.
 """
-SQLI_PAYLOADS = [
+SQLI_PAYLOADS = (
     "' OR 1=1--",
     '" OR 1=1--',
     "' OR 'a'='a",
@@ -14,4 +14,4 @@ SQLI_PAYLOADS = [
     "' UNION SELECT NULL--",
     '"; DROP TABLE users;--',
     "' OR SLEEP(5)--",
-] 
\ No newline at end of file
+) 
\ No newline at end of file
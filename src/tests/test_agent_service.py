@@ -0,0 +1,21 @@
+import json
+from src.agent import agent_service, logging_utils
+from src.tools.python_repl_tool import PythonREPLTool
+
+class StubLLM:
+    def generate(self, prompt, stop_words=None):
+        if 'reply with exactly INVESTIGATE' in prompt:
+            return 'INVESTIGATE'
+        if 'Reply with CONTINUE or STOP' in prompt:
+            return 'STOP done'
+        if 'Report:' in prompt:
+            return '# Report'
+        return 'Use PythonREPLTool: x = 2**100'
+
+def test_job_survives_results_orjson_cannot_encode(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_service, '_shared_tools_and_llm', lambda: ((PythonREPLTool(),), StubLLM()))
+    agent_service.run_agent_job('scan http://example.test for sqli', str(tmp_path), 'test')
+    logging_utils.close_logs()
+    events = [json.loads(line) for line in (tmp_path / 'events.jsonl').read_text().splitlines()]
+    assert [e['type'] for e in events] == ['USER', 'STARTED', 'Thought', 'Action', 'Observation', 'Report', 'DONE']
+    assert events[3]['content']['locals']['x'] == 2**100
\ No newline at end of file
@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from src.agent import logging_utils
+from src.agent.logging_utils import BackgroundAppender
+
+def test_appender_writes_queued_lines_on_close(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    writer = BackgroundAppender(str(path))
+    for i in range(100):
+        writer.write(f'{i}\n'.encode())
+    writer.close()
+    assert path.read_text().splitlines() == [str(i) for i in range(100)]
+
+def test_write_after_close_is_not_dropped(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    writer = BackgroundAppender(str(path))
+    writer.write(b'before\n')
+    writer.close()
+    writer.write(b'after\n')
+    writer.close()
+    assert path.read_text() == 'before\nafter\n'
+
+def test_log_event_keeps_entries_orjson_cannot_encode(tmp_path):
+    logging_utils.set_log_paths(str(tmp_path / 'p.json'), str(tmp_path / 'd.log'))
+    logging_utils.log_observation({'x': 2**100})
+    logging_utils.log_thought('next')
+    logging_utils.close_logs()
+    entries = [json.loads(line) for line in (tmp_path / 'p.json').read_text().splitlines()]
+    assert [e['content'] for e in entries] == [{'x': 2**100}, 'next']
+
+def test_log_event_survives_unopenable_log_path(tmp_path):
+    logging_utils.set_log_paths(str(tmp_path / 'missing' / 'p.json'), str(tmp_path / 'd.log'))
+    logging_utils.log_thought('x')
+    logging_utils.close_logs()
+    assert '[LOGGING ERROR]' in (tmp_path / 'd.log').read_text()
+
+def test_concurrent_first_writes_share_one_appender(tmp_path, monkeypatch):
+    created = []
+    class CountingAppender(BackgroundAppender):
+        def __init__(self, path):
+            created.append(path)
+            time.sleep(0.01)
+            super().__init__(path)
+    monkeypatch.setattr(logging_utils, 'BackgroundAppender', CountingAppender)
+    logging_utils.set_log_paths(str(tmp_path / 'p.json'), str(tmp_path / 'd.log'))
+    threads = [threading.Thread(target=logging_utils.log_thought, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    logging_utils.close_logs()
+    assert created == [str(tmp_path / 'p.json')]
+    entries = [json.loads(line) for line in (tmp_path / 'p.json').read_text().splitlines()]
+    assert sorted(e['content'] for e in entries) == list(range(8))
+
+def test_log_event_writes_tuple_keyed_dict_as_repr(tmp_path):
+    logging_utils.set_log_paths(str(tmp_path / 'p.json'), str(tmp_path / 'd.log'))
+    logging_utils.log_observation({(1, 2): 3})
+    logging_utils.log_thought('next')
+    logging_utils.close_logs()
+    entries = [json.loads(line) for line in (tmp_path / 'p.json').read_text().splitlines()]
+    assert [e['content'] for e in entries] == ['{(1, 2): 3}', 'next']
+
+def test_log_event_writes_self_referencing_dict_as_repr(tmp_path):
+    logging_utils.set_log_paths(str(tmp_path / 'p.json'), str(tmp_path / 'd.log'))
+    d = {'a': 1}
+    d['self'] = d
+    logging_utils.log_observation(d)
+    logging_utils.log_thought('next')
+    logging_utils.close_logs()
+    entries = [json.loads(line) for line in (tmp_path / 'p.json').read_text().splitlines()]
+    assert [e['content'] for e in entries] == [repr(d), 'next']
@@ -0,0 +1,10 @@
+from src.agent import logging_utils
+from src.agent.reporting import generate_report
+
+def test_report_keeps_ints_wider_than_64_bits(tmp_path):
+    logging_utils.set_log_paths(str(tmp_path / 'p.json'), str(tmp_path / 'd.log'))
+    logging_utils.log_action({'tool': 'ShellTool', 'arg': 'echo'})
+    logging_utils.log_observation({'x': 2**100})
+    logging_utils.close_logs()
+    generate_report(str(tmp_path / 'p.json'), str(tmp_path / 'report.md'))
+    assert str(2**100) in (tmp_path / 'report.md').read_text()
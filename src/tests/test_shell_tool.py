@@ -0,0 +1,44 @@
+import os
+import time
+from src.tools.shell_tool import ShellTool, _plain_argv
+
+def test_plain_commands_skip_the_shell():
+    assert _plain_argv('nmap -sV "scan me.example"') == ['nmap', '-sV', 'scan me.example']
+
+def test_shell_syntax_goes_to_the_shell():
+    for command in ['echo hi | tr a-z A-Z', 'ls > out', 'a && b', 'echo $HOME', 'ls *.py', 'ls /etc/host[s]',
+                    'echo a # b', 'FOO=1 env', 'echo "unbalanced', '']:
+        assert _plain_argv(command) is None, command
+
+def test_env_prefixed_command():
+    result = ShellTool().execute('FOO=1 env')
+    assert result['returncode'] == 0
+    assert 'FOO=1' in result['stdout']
+
+def test_builtin_falls_back_to_the_shell():
+    result = ShellTool().execute('cd /tmp')
+    assert result['returncode'] == 0
+    assert result['stderr'] == ''
+
+def test_comment_is_not_echoed():
+    assert ShellTool().execute('echo a # b')['stdout'] == 'a\n'
+
+def test_missing_command_is_reported_by_the_shell():
+    result = ShellTool().execute('nosuchcmd_penagent --flag')
+    assert result['returncode'] == 127
+    assert 'nosuchcmd_penagent' in result['stderr']
+def test_commands_do_not_read_the_callers_stdin():
+    # Give this process a stdin that never reaches EOF, as an operator's terminal would
+    read_fd, write_fd = os.pipe()
+    saved_stdin = os.dup(0)
+    os.dup2(read_fd, 0)
+    try:
+        start = time.monotonic()
+        result = ShellTool().execute('cat')
+    finally:
+        os.dup2(saved_stdin, 0)
+        for fd in (saved_stdin, read_fd, write_fd):
+            os.close(fd)
+    assert time.monotonic() - start < 5
+    assert result['returncode'] == 0
+    assert result['stdout'] == ''
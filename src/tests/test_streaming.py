@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import time
+import pytest
+from src.tools.streaming import stream_process, collect_output
+
+def test_splits_lines_and_keeps_unterminated_tail():
+    events = list(stream_process(['printf', 'a\\nb\\nc'], timeout=5))
+    assert events == [('stdout', 'a\n'), ('stdout', 'b\n'), ('stdout', 'c'), ('returncode', 0)]
+
+def test_interleaved_stderr_is_streamed_alongside_stdout():
+    script = (
+        "import sys, time\n"
+        "for i in range(3):\n"
+        "    print('out', i, flush=True)\n"
+        "    print('err', i, file=sys.stderr, flush=True)\n"
+        "    time.sleep(0.05)\n"
+        "sys.exit(2)\n"
+    )
+    events = list(stream_process([sys.executable, '-c', script], timeout=5))
+    assert [data for stream, data in events if stream == 'stdout'] == ['out 0\n', 'out 1\n', 'out 2\n']
+    assert [data for stream, data in events if stream == 'stderr'] == ['err 0\n', 'err 1\n', 'err 2\n']
+    assert events[-1] == ('returncode', 2)
+    # stderr lines arrive while stdout is still open, not after it
+    assert events.index(('stderr', 'err 0\n')) < events.index(('stdout', 'out 2\n'))
+
+def test_large_output_on_both_pipes_does_not_stall():
+    script = "import sys; sys.stdout.write('x' * 200000); sys.stderr.write('y' * 200000)"
+    result = collect_output(stream_process([sys.executable, '-c', script], timeout=10))
+    assert len(result['stdout']) == 200000
+    assert len(result['stderr']) == 200000
+    assert result['returncode'] == 0
+
+def test_waits_for_process_that_closed_its_pipes():
+    events = list(stream_process(['sh', '-c', 'exec 1>&- 2>&-; sleep 0.5; exit 3'], timeout=5))
+    assert events == [('returncode', 3)]
+
+def test_timeout_kills_process():
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(stream_process(['sleep', '30'], timeout=0.5))
+    assert time.monotonic() - start < 5
+
+def test_timeout_applies_after_pipes_close():
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(stream_process(['sh', '-c', 'exec 1>&- 2>&-; sleep 30'], timeout=0.5))
+
+def test_early_close_kills_process():
+    events = stream_process(['sh', '-c', 'echo started; sleep 30'], timeout=60)
+    assert next(events) == ('stdout', 'started\n')
+    start = time.monotonic()
+    events.close()
+    assert time.monotonic() - start < 5
\ No newline at end of file
@@ -1,4 +1,4 @@
-import subprocess
+from src.tools.streaming import stream_process, collect_output
 
 class KaliContainerTool:
     """
@@ -11,14 +11,13 @@ class KaliContainerTool:
     def execute(self, command):
         """Execute a shell command inside the Kali container and return output."""
         try:
-            docker_cmd = [
-                'docker', 'exec', self.container_name, '/bin/bash', '-l', '-c', command
-            ]
-            result = subprocess.run(docker_cmd, capture_output=True, text=True, timeout=120)
-            return {
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'returncode': result.returncode
-            }
+            return collect_output(self.execute_stream(command))
         except Exception as e:
-            return {'error': str(e)} 
\ No newline at end of file
+            return {'error': str(e)}
+
+    def execute_stream(self, command):
+        """Yield ('stdout' | 'stderr', line) as the command produces output, then ('returncode', code)."""
+        docker_cmd = [
+            'docker', 'exec', self.container_name, '/bin/bash', '-l', '-c', command
+        ]
+        yield from stream_process(docker_cmd, timeout=120)
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Long-lived Playwright worker, run inside the pentest-playwright container.
+Reads one JSON request per line on stdin and answers each with one JSON line on stdout.
+The browser is launched once and every request gets a fresh page.
+"""
+import asyncio
+import json
+import sys
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright
+
+SPIDER_CONCURRENCY = 8
+
+
+async def browse(browser, url):
+    page = await browser.new_page()
+    try:
+        await page.goto(url, timeout=30000)
+        return {'content': await page.content()}
+    finally:
+        await page.close()
+
+
+async def spider(browser, url, max_depth=2, concurrency=SPIDER_CONCURRENCY):
+    """Breadth-first same-host crawl, loading up to `concurrency` pages of a level at once."""
+    netloc = urlparse(url).netloc
+    visited = {url}
+    frontier = [url]
+    semaphore = asyncio.Semaphore(concurrency)
+    idle_pages = []
+    all_pages = []
+
+    async def links_of(target):
+        async with semaphore:
+            if idle_pages:
+                page = idle_pages.pop()
+            else:
+                page = await browser.new_page()
+                all_pages.append(page)
+            try:
+                await page.goto(target, timeout=10000)
+                return await page.eval_on_selector_all('a', 'elements => elements.map(e => e.href)')
+            except Exception:
+                return []
+            finally:
+                idle_pages.append(page)
+
+    try:
+        # Links found on the last level are reported but not loaded
+        for _ in range(max_depth):
+            next_frontier = []
+            for links in await asyncio.gather(*(links_of(target) for target in frontier)):
+                for link in links:
+                    if link and link not in visited and urlparse(link).netloc == netloc:
+                        visited.add(link)
+                        next_frontier.append(link)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+    finally:
+        for page in all_pages:
+            await page.close()
+    return {'urls': sorted(visited)}
+
+
+HANDLERS = {'browse': browse, 'spider': spider}
+
+
+async def main():
+    loop = asyncio.get_running_loop()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            if not line.strip():
+                continue
+            if not browser.is_connected():
+                browser = await p.chromium.launch()
+            try:
+                request = json.loads(line)
+                response = await HANDLERS[request.pop('op')](browser, **request)
+            except Exception as e:
+                response = {'error': f'{type(e).__name__}: {e}'}
+            sys.stdout.write(json.dumps(response) + '\n')
+            sys.stdout.flush()
+        await browser.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
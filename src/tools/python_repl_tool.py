@@ -1,5 +1,11 @@
 import io
 import contextlib
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def _compile(code):
+    # Snippets are often re-run verbatim (e.g. the same parser over each payload's response)
+    return compile(code, '<repl>', 'exec')
 
 class PythonREPLTool:
     """Tool for executing Python code snippets for analysis/parsing."""
@@ -9,7 +15,7 @@ class PythonREPLTool:
         local_vars = {}
         try:
             with contextlib.redirect_stdout(output):
-                exec(code, {}, local_vars)
+                exec(_compile(code), {}, local_vars)
             return {'output': output.getvalue(), 'locals': local_vars}
         except Exception as e:
             return {'error': str(e)} 
\ No newline at end of file
@@ -1,10 +1,36 @@
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = 1024
+
+
 class RAGTool:
     """Tool for retrieval-augmented generation using a vector store (e.g., Pinecone)."""
+    def __init__(self):
+        # Exact-query LRU of retrieved docs, stored as tuples so cached results can't be mutated
+        self._cache = OrderedDict()
+        # The tool is shared across concurrent jobs, so cache reads and updates are locked
+        self._cache_lock = threading.Lock()
+
     def embed(self, text):
         """Embed text and store in vector DB."""
         # TODO: Integrate with Pinecone and OpenAI
         return {'embedding_id': 'placeholder'}
+
     def retrieve(self, query):
-        """Retrieve relevant docs from vector DB for a query."""
+        """Retrieve relevant docs from vector DB for a query (memoized per exact query)."""
+        with self._cache_lock:
+            docs = self._cache.get(query)
+            if docs is not None:
+                self._cache.move_to_end(query)
+        if docs is None:
+            docs = tuple(self._query_store(query))
+            with self._cache_lock:
+                self._cache[query] = docs
+                if len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return {'docs': list(docs)}
+
+    def _query_store(self, query):
         # TODO: Integrate with Pinecone and OpenAI
-        return {'docs': ['placeholder doc 1', 'placeholder doc 2']} 
\ No newline at end of file
+        return ['placeholder doc 1', 'placeholder doc 2']
\ No newline at end of file
@@ -1 +1,43 @@
+import shlex
+from src.tools.streaming import stream_process, collect_output
 
+# Commands using any of these need /bin/sh (pipes, redirects, chaining, expansion, globbing, comments)
+_SHELL_CHARS = frozenset('|&;<>()$`*?[~#\n')
+
+def _plain_argv(command):
+    """argv for a command that can run without a shell, or None if it needs /bin/sh."""
+    if _SHELL_CHARS.intersection(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None  # unbalanced quotes, let the shell report it
+    # Empty commands and env assignments like `FOO=1 cmd` are shell syntax
+    if not argv or '=' in argv[0]:
+        return None
+    return argv
+
+class ShellTool:
+    """Tool for executing local shell commands."""
+    def execute(self, command):
+        """Execute a command and return output. Plain commands run without spawning a shell."""
+        try:
+            return collect_output(self.execute_stream(command))
+        except Exception as e:
+            return {'error': str(e)}
+
+    def execute_stream(self, command):
+        """Yield ('stdout' | 'stderr', line) while the command runs, then ('returncode', code)."""
+        argv = _plain_argv(command)
+        if argv:
+            events = stream_process(argv, timeout=60)
+            try:
+                first = next(events)
+            except OSError:
+                # Not an executable on PATH (a builtin like cd, or missing): the shell handles and reports it
+                pass
+            else:
+                yield first
+                yield from events
+                return
+        yield from stream_process(command, timeout=60, shell=True)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import os
+import selectors
+import subprocess
+import time
+
+def stream_process(args, timeout, shell=False):
+    """
+    Run a process and yield ('stdout' | 'stderr', line) as output arrives, then ('returncode', code).
+    Both pipes are read together, so a chatty stderr cannot stall stdout.
+    Raises subprocess.TimeoutExpired (after killing the process) once timeout seconds have passed;
+    closing the generator early also kills the process.
+    """
+    # stdin is closed so commands like cat or ssh never read from the operator's terminal
+    proc = subprocess.Popen(args, shell=shell, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + timeout
+    partial = {'stdout': b'', 'stderr': b''}
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ, 'stdout')
+            selector.register(proc.stderr, selectors.EVENT_READ, 'stderr')
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                for key, _ in selector.select(remaining):
+                    stream = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        if partial[stream]:
+                            yield stream, partial[stream].decode('utf-8', errors='replace')
+                        continue
+                    lines = (partial[stream] + chunk).split(b'\n')
+                    partial[stream] = lines.pop()
+                    for line in lines:
+                        yield stream, (line + b'\n').decode('utf-8', errors='replace')
+        # Both pipes hit EOF; the process may still be running (e.g. it closed its output early)
+        try:
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            raise subprocess.TimeoutExpired(args, timeout)
+    finally:
+        # The process is only still alive here on timeout, error or when the consumer stopped early
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+    yield 'returncode', proc.returncode
+
+def collect_output(events):
+    """Drain a stream_process-style generator into the {'stdout', 'stderr', 'returncode'} result dict."""
+    output = {'stdout': [], 'stderr': []}
+    returncode = None
+    for stream, data in events:
+        if stream == 'returncode':
+            returncode = data
+        else:
+            output[stream].append(data)
+    return {'stdout': ''.join(output['stdout']), 'stderr': ''.join(output['stderr']), 'returncode': returncode}
\ No newline at end of file
@@ -1,126 +1,105 @@
 import subprocess
-import uuid
 import os
 import re
+import json
+import time
+import atexit
+import select
+import tempfile
+import threading
+
+_URL_RE = re.compile(r'https?://\S+')
+
+CONTAINER = 'pentest-playwright'
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'playwright_worker.py')
+_WORKER_PATH = '/app/playwright_worker.py'
+# Bytes of worker stderr attached to error results
+_STDERR_TAIL = 4096
+# One Playwright worker (and browser) in the container, shared by all tool instances
+_WORKER = None
+_WORKER_STDERR = None
+_WORKER_LOCK = threading.Lock()
+
+def _start_worker():
+    global _WORKER, _WORKER_STDERR
+    subprocess.run(['docker', 'cp', _WORKER_SCRIPT, f'{CONTAINER}:{_WORKER_PATH}'], check=True)
+    # stderr goes to a temp file rather than a pipe nobody drains, so it can be reported on failure
+    _WORKER_STDERR = tempfile.TemporaryFile()
+    _WORKER = subprocess.Popen(
+        ['docker', 'exec', '-i', CONTAINER, 'python', '-u', _WORKER_PATH],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=_WORKER_STDERR
+    )
+
+def _stop_worker():
+    """Kill the worker and return the tail of its stderr."""
+    global _WORKER, _WORKER_STDERR
+    stderr = ''
+    if _WORKER is not None:
+        _WORKER.kill()
+        _WORKER.wait()
+        _WORKER = None
+    if _WORKER_STDERR is not None:
+        size = _WORKER_STDERR.seek(0, os.SEEK_END)
+        _WORKER_STDERR.seek(max(size - _STDERR_TAIL, 0))
+        stderr = _WORKER_STDERR.read().decode('utf-8', errors='replace')
+        _WORKER_STDERR.close()
+        _WORKER_STDERR = None
+    return stderr
+
+atexit.register(_stop_worker)
+
+def _read_response(proc, timeout):
+    """Read one newline-terminated response; None on timeout, b'' if the worker exited."""
+    deadline = time.monotonic() + timeout
+    chunks = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([proc.stdout], [], [], remaining)[0]:
+            return None
+        chunk = os.read(proc.stdout.fileno(), 65536)
+        if not chunk:
+            return b''
+        chunks.append(chunk)
+        # JSON escapes newlines inside strings, so the only newline ends the response
+        if chunk.endswith(b'\n'):
+            return b''.join(chunks)
+
+def _worker_request(request, timeout):
+    """Send one request to the Playwright worker, starting or restarting it as needed."""
+    with _WORKER_LOCK:
+        try:
+            if _WORKER is None or _WORKER.poll() is not None:
+                _stop_worker()
+                _start_worker()
+            _WORKER.stdin.write(json.dumps(request).encode() + b'\n')
+            _WORKER.stdin.flush()
+            line = _read_response(_WORKER, timeout)
+        except (OSError, subprocess.SubprocessError) as e:
+            return {'error': f'Playwright worker failed: {e}', 'stderr': _stop_worker()}
+        if line is None:
+            return {'error': f'Playwright worker timed out after {timeout}s', 'stderr': _stop_worker()}
+        if not line:
+            return {'error': 'Playwright worker exited', 'stderr': _stop_worker()}
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            # The pipe is out of sync with the worker, so start a fresh one next time
+            return {'error': f'Invalid response from Playwright worker: {e}', 'stderr': _stop_worker()}
 
 class WebBrowserTool:
     """Tool for headless web browsing and screenshot capture using Playwright in a container."""
-    def __init__(self, output_dir='outputs'):
-        self.output_dir = output_dir
-        os.makedirs(self.output_dir, exist_ok=True)
-
     def browse(self, arg):
         # Extract the URL from the argument (handles 'browse <url>')
-        match = re.search(r'(https?://\S+)', arg)
+        match = _URL_RE.search(arg)
         if match:
-            url = match.group(1)
+            url = match.group(0)
         else:
             url = arg.strip()
-        session_id = str(uuid.uuid4())
-        output_file_host = os.path.join(self.output_dir, f'browser_output_{session_id}.html')
-        output_file_container = f'/app/outputs/browser_output_{session_id}.html'
-        # Run Playwright in the container to fetch the page content
-        playwright_script = f"""
-import asyncio
-from playwright.async_api import async_playwright
-async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        await page.goto('{url}', timeout=30000)
-        content = await page.content()
-        with open('{output_file_container}', 'w') as f:
-            f.write(content)
-        await browser.close()
-asyncio.run(main())
-"""
-        script_file_host = os.path.join(self.output_dir, f'playwright_script_{session_id}.py')
-        with open(script_file_host, 'w') as f:
-            f.write(playwright_script)
-        # Copy script into container and execute
-        subprocess.run([
-            'docker', 'cp', script_file_host, f'pentest-playwright:/app/outputs/playwright_script_{session_id}.py'
-        ], check=True)
-        docker_cmd = [
-            'docker', 'exec', 'pentest-playwright',
-            'python', f'/app/outputs/playwright_script_{session_id}.py'
-        ]
-        result = subprocess.run(docker_cmd, capture_output=True, text=True, timeout=60)
-        # Read the output file
-        try:
-            with open(output_file_host, 'r') as f:
-                content = f.read()
-        except Exception as e:
-            content = f'[Error reading output file: {e}]'
-        # Cleanup script file
-        try:
-            os.remove(script_file_host)
-        except Exception:
-            pass
-        return {'content': content, 'stdout': result.stdout, 'stderr': result.stderr, 'returncode': result.returncode}
+        return _worker_request({'op': 'browse', 'url': url}, timeout=60)
 
     def screenshot(self, url, output_path):
         # Similar logic can be implemented for screenshots if needed
         return {'error': 'Screenshot via container not yet implemented'}
 
     def spider(self, url, max_depth=2):
-        session_id = str(uuid.uuid4())
-        output_file_host = os.path.join(self.output_dir, f'spider_output_{session_id}.txt')
-        output_file_container = f'/app/outputs/spider_output_{session_id}.txt'
-        playwright_script = f"""
-import asyncio
-from playwright.async_api import async_playwright
-from urllib.parse import urljoin, urlparse
-import sys
-import os
-
-visited = set()
-found = set()
-
-async def crawl(page, base_url, depth, max_depth):
-    if depth > max_depth or base_url in visited:
-        return
-    visited.add(base_url)
-    found.add(base_url)
-    try:
-        await page.goto(base_url, timeout=10000)
-        links = await page.eval_on_selector_all('a', 'elements => elements.map(e => e.href)')
-        for link in links:
-            if link and urlparse(link).netloc == urlparse(base_url).netloc:
-                await crawl(page, link, depth + 1, max_depth)
-    except Exception as e:
-        pass
-
-async def main():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        await crawl(page, '{url}', 0, {max_depth})
-        with open('{output_file_container}', 'w') as f:
-            for u in sorted(found):
-                f.write(u + '\n')
-        await browser.close()
-asyncio.run(main())
-"""
-        script_file_host = os.path.join(self.output_dir, f'playwright_spider_{session_id}.py')
-        with open(script_file_host, 'w') as f:
-            f.write(playwright_script)
-        subprocess.run([
-            'docker', 'cp', script_file_host, f'pentest-playwright:/app/outputs/playwright_spider_{session_id}.py'
-        ], check=True)
-        docker_cmd = [
-            'docker', 'exec', 'pentest-playwright',
-            'python', f'/app/outputs/playwright_spider_{session_id}.py'
-        ]
-        result = subprocess.run(docker_cmd, capture_output=True, text=True, timeout=180)
-        urls = []
-        try:
-            with open(output_file_host, 'r') as f:
-                urls = [line.strip() for line in f if line.strip()]
-        except Exception as e:
-            urls = [f'[Error reading spider output: {e}]']
-        try:
-            os.remove(script_file_host)
-        except Exception:
-            pass
-        return {'urls': urls, 'stdout': result.stdout, 'stderr': result.stderr, 'returncode': result.returncode} 
\ No newline at end of file
+        return _worker_request({'op': 'spider', 'url': url, 'max_depth': max_depth}, timeout=180)
\ No newline at end of file
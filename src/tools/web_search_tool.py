@@ -1,20 +1,26 @@
 import requests
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+
+def _parse_results(html, limit=5):
+    """Extract the top result links from a DuckDuckGo HTML results page."""
+    tree = LexborHTMLParser(html)
+    return [{'title': node.text(), 'href': node.attributes.get('href') or ''} for node in tree.css('.result__a')[:limit]]
 
 class WebSearchTool:
     """Tool for querying search engines and fetching results programmatically."""
+    def __init__(self):
+        # Keep-alive session so repeated searches reuse the TLS connection to DuckDuckGo
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
     def search(self, query):
         """Search the web and return results."""
         try:
-            resp = requests.get('https://duckduckgo.com/html/', params={'q': query}, timeout=10)
+            resp = self.session.get('https://duckduckgo.com/html/', params={'q': query}, timeout=10)
             if resp.status_code == 200:
-                # Simple parse for result links
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                results = []
-                for a in soup.select('.result__a')[:5]:
-                    results.append({'title': a.get_text(), 'href': a['href']})
-                return {'results': results}
+                return {'results': _parse_results(resp.text)}
             else:
                 return {'error': f'Status {resp.status_code}'}
         except Exception as e:
-            return {'error': str(e)} 
\ No newline at end of file
+            return {'error': str(e)}
\ No newline at end of file